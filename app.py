@@ -1,12 +1,10 @@
+import csv
 import os
 import io
 import tempfile
-import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 import streamlit as st
-
-# import your modules
-from extract import extract_resume_text, clean_text
-from jobmatcher import extract_keywords, calculate_match
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 
 st.set_page_config(page_title="JD ↔ Resume Matcher", page_icon="🎯", layout="wide")
 
@@ -19,18 +17,44 @@ def _read_text_file(uploaded):
             continue
     return bytes_data.decode(errors="ignore")
 
-@st.cache_data(show_spinner=False)
-def _extract_from_path(tmp_path):
-    raw, cleaned = extract_resume_text(tmp_path, clean=True)
+def _to_csv(rows, header):
+    buf = io.StringIO()
+    w = csv.writer(buf, lineterminator="\n")
+    w.writerow([header])
+    w.writerows([r] for r in rows)
+    return buf.getvalue().encode()
+
+# Keyed on the uploaded bytes (a temp path would never hit); in-memory and
+# bounded, since resumes are personal data.
+@st.cache_data(show_spinner=False, max_entries=32, ttl=3600)
+def _extract_from_upload(data, ext):
+    with tempfile.NamedTemporaryFile(delete=False, suffix=ext) as tmp:
+        tmp.write(data); tmp_path = tmp.name
+    try:
+        raw, cleaned = extract_resume_text(tmp_path, clean=True)
+    finally:
+        os.remove(tmp_path)
     return raw, cleaned
 
-@st.cache_data(show_spinner=False)
-def _keywords(text):
-    return extract_keywords(text)
+# cache_resource skips the pickle round-trip of cache_data; args with a leading
+# underscore are not hashed by Streamlit, so each cache is keyed by its
+# jd_key / text_key argument only.
+@st.cache_resource(show_spinner=False, max_entries=32, ttl=3600)
+def _jd_keywords(jd_key, _jd_text):
+    return frozenset(extract_keywords(_jd_text))
+
+@st.cache_resource(show_spinner=False, max_entries=32, ttl=3600)
+def _jd_automaton(jd_key, _jd_kw):
+    return build_keyword_automaton(_jd_kw)
+
+def _jd_setup(jd_key, jd_text):
+    jd_kw = _jd_keywords(jd_key, jd_text)
+    return jd_kw, _jd_automaton(jd_key, jd_kw)
 
-@st.cache_data(show_spinner=False)
-def _match(resume_kw, jd_kw):
-    return calculate_match(resume_kw, jd_kw)
+@st.cache_resource(show_spinner=False, max_entries=32, ttl=3600)
+def _resume_keywords(text_key, _resume_text, _jd_kw, _automaton):
+    # exact-match scan first; full extraction unless every JD term is hit
+    return frozenset(extract_resume_keywords(_resume_text, _jd_kw, automaton=_automaton))
 
 st.title("JD ↔ Resume Matcher (MVP)")
 st.caption("Weeks 7–8 – Upload your resume & JD to see how well they match.")
@@ -59,25 +83,37 @@ if run_btn:
     if not jd_text.strip():
         st.warning("Please paste the Job Description."); st.stop()
 
-    if resume_file:
-        ext = os.path.splitext(resume_file.name)[1].lower()
-        if ext == ".txt":
-            extracted_raw = _read_text_file(resume_file)
-            extracted_clean = clean_text(extracted_raw)
+    # import your modules (deferred: spaCy/rapidfuzz only load once the user asks for a match)
+    from extract import extract_resume_text, clean_text
+    from jobmatcher import extract_keywords, extract_resume_keywords, build_keyword_automaton, calculate_match_cached, to_surface
+
+    # JD keywords don't depend on the resume, so build them in the
+    # background while the resume file is parsed. The worker gets this run's
+    # ScriptRunContext so the st.cache_resource calls behave as on the main thread.
+    jd_key = hash(jd_text)
+    with ThreadPoolExecutor(max_workers=1, initializer=add_script_run_ctx,
+                            initargs=(None, get_script_run_ctx())) as ex:
+        fut_jd = ex.submit(_jd_setup, jd_key, jd_text)
+
+        if resume_file:
+            ext = os.path.splitext(resume_file.name)[1].lower()
+            if ext == ".txt":
+                extracted_raw = _read_text_file(resume_file)
+                extracted_clean = clean_text(extracted_raw)
+            else:
+                extracted_raw, extracted_clean = _extract_from_upload(resume_file.read(), ext)
         else:
-            with tempfile.NamedTemporaryFile(delete=False, suffix=ext) as tmp:
-                tmp.write(resume_file.read()); tmp_path = tmp.name
-            try:
-                extracted_raw, extracted_clean = _extract_from_path(tmp_path)
-            finally:
-                os.remove(tmp_path)
-    else:
-        extracted_raw = resume_text; extracted_clean = clean_text(extracted_raw)
+            extracted_raw = resume_text; extracted_clean = clean_text(extracted_raw)
 
     with st.spinner("Extracting & matching..."):
-        resume_kw = _keywords(extracted_clean)
-        jd_kw = _keywords(jd_text)
-        result = _match(resume_kw, jd_kw)
+        text_key = hash((extracted_clean, jd_text))
+        jd_kw, automaton = fut_jd.result()
+        resume_kw = _resume_keywords(text_key, extracted_clean, jd_kw, automaton)
+        # frozensets -> memoized with a plain lru_cache (survives script reruns)
+        result = calculate_match_cached(resume_kw, jd_kw)
+        # show words, not stems (all result terms come from the JD)
+        for k in ("common", "fuzzy_common", "missing"):
+            result[k] = to_surface(result[k], jd_text)
 
     st.success("Done!")
 
@@ -101,10 +137,10 @@ if run_btn:
 
     st.divider()
     st.subheader("Download Reports")
-    csv_matched = pd.DataFrame(sorted(result.get("common", [])), columns=["matched"]).to_csv(index=False).encode()
+    csv_matched = _to_csv(sorted(result.get("common", [])), "matched")
     st.download_button("Download Matched CSV", csv_matched, "matched_keywords.csv")
 
-    csv_missing = pd.DataFrame(sorted(result.get("missing", [])), columns=["missing"]).to_csv(index=False).encode()
+    csv_missing = _to_csv(sorted(result.get("missing", [])), "missing")
     st.download_button("Download Missing CSV", csv_missing, "missing_keywords.csv")
 
     report = io.StringIO()
@@ -1,10 +1,15 @@
 import argparse
+import functools
+import io
 import os
 import re
+import threading
+from collections import Counter
 from typing import Tuple, List
 
 # PDF
 import pdfplumber
+import pypdfium2 as pdfium
 
 # DOCX
 from docx import Document
@@ -15,10 +20,25 @@ from docx import Document
 _ALLOWED_CHARS = r"[^a-z0-9@\.\+\-#/_&\s\n]"
 BULLETS = ["•", "◦", "·", "●", "–", "—", "•", "▪", "‣"]
 
+# Precompiled so each cleaning step is a single scan of the text
+_BULLET_RE = re.compile("[" + "".join(re.escape(b) for b in BULLETS) + "]")
+_DISALLOWED_RE = re.compile(_ALLOWED_CHARS)
+_WS_RE = re.compile(r"[ \t]{2,}")
+_NL_RE = re.compile(r"\n{3,}")
+class _DisallowedTable(dict):
+    """
+    str.translate table equivalent to _DISALLOWED_RE.sub(" ", ...): each code
+    point is classified once on first sight, so any text is one C pass.
+    """
+    def __missing__(self, cp: int):
+        value = " " if _DISALLOWED_RE.match(chr(cp)) else cp
+        self[cp] = value
+        return value
+
+_TRANS = _DisallowedTable()
+
 def normalize_bullets(text: str) -> str:
-    for b in BULLETS:
-        text = text.replace(b, "\n- ")
-    return text
+    return _BULLET_RE.sub("\n- ", text)
 
 def de_duplicate_headers_footers(lines: List[str]) -> List[str]:
     """
@@ -27,60 +47,84 @@ def de_duplicate_headers_footers(lines: List[str]) -> List[str]:
     Works best when called per page and then across all pages.
     Here we apply a simple global de-dup across the whole doc.
     """
-    freq = {}
-    for ln in lines:
-        k = ln.strip()
-        if not k:
-            continue
-        freq[k] = freq.get(k, 0) + 1
+    stripped = [ln.strip() for ln in lines]
+    freq = Counter(s for s in stripped if s)
     if not freq:
         return lines
     threshold = max(2, int(0.4 * max(freq.values())))
-    return [ln for ln in lines if freq.get(ln.strip(), 0) < threshold]
+    return [ln for ln, s in zip(lines, stripped) if freq.get(s, 0) < threshold]
 
+# Memoized: Streamlit reruns re-clean the same resume whenever the JD changes
+@functools.lru_cache(maxsize=64)
 def clean_text(text: str) -> str:
     text = text.replace("\r", "\n")
     text = normalize_bullets(text)
-    text = text.lower()
-    text = re.sub(_ALLOWED_CHARS, " ", text)       # strip disallowed chars
-    text = re.sub(r"[ \t]{2,}", " ", text)         # collapse spaces/tabs
-    text = re.sub(r"\n{3,}", "\n\n", text)         # limit blank lines
+    text = text.lower().translate(_TRANS)           # strip disallowed chars
+    text = _WS_RE.sub(" ", text)                    # collapse spaces/tabs
+    text = _NL_RE.sub("\n\n", text)                 # limit blank lines
     # keep hyphenated tech tokens as-is; ensure space around slashes when needed
     return text.strip()
 
 # ---------- PDF ----------
 
+# Serializes all PDFium calls across documents and threads
+_PDFIUM_LOCK = threading.Lock()
+
 def _page_text_safe(page) -> str:
     txt = page.extract_text(x_tolerance=2, y_tolerance=2)
     return txt or ""
 
-def is_scanned_pdf(pdf_path: str, sample_pages: int = 3) -> bool:
+def _pdfium_page_text(page) -> str:
+    textpage = page.get_textpage()
     try:
-        with pdfplumber.open(pdf_path) as pdf:
-            pages = pdf.pages[:sample_pages] if len(pdf.pages) > sample_pages else pdf.pages
-            empty_count = 0
-            for p in pages:
-                if not _page_text_safe(p).strip():
-                    empty_count += 1
-            # mostly empty text across samples -> likely scanned
-            return empty_count >= max(1, len(pages) - 1)
-    except Exception:
-        return False
-
-def extract_text_from_pdf(path: str) -> str:
-    texts = []
-    with pdfplumber.open(path) as pdf:
-        for page in pdf.pages:
-            t = _page_text_safe(page)
-            if not t:
-                continue
-            # split to lines to help downstream header/footer trimming
-            texts.append(t)
-    out = "\n".join(texts)
+        return textpage.get_text_range() or ""
+    finally:
+        textpage.close()
+
+def extract_text_from_pdf(path: str, layout: bool = False, sample_pages: int = 3) -> Tuple[str, bool]:
+    """
+    Returns (text, is_scanned_hint) from a single open/parse of the PDF.
+    Text extraction uses PDFium (fast C++ backend).
+    layout=True falls back to pdfplumber for layout-aware extraction.
+    is_scanned_hint: the first sample_pages pages are mostly empty of text
+    (likely an image-only scan that needs OCR).
+    """
+    buf = io.StringIO()
+    n_sampled = 0
+    empty_count = 0
+    if layout:
+        with pdfplumber.open(path) as pdf:
+            for i, page in enumerate(pdf.pages):
+                t = _page_text_safe(page)
+                if i < sample_pages:
+                    n_sampled += 1
+                    if not t.strip():
+                        empty_count += 1
+                if t:
+                    buf.write(t)
+                    buf.write("\n")
+                # release cached chars/lines so long docs don't pile up in RAM
+                page.flush_cache()
+    else:
+        # PDFium is not thread-safe (Streamlit runs sessions in parallel threads)
+        with _PDFIUM_LOCK, pdfium.PdfDocument(path) as pdf:
+            for i, page in enumerate(pdf):
+                t = _pdfium_page_text(page)
+                if i < sample_pages:
+                    n_sampled += 1
+                    if not t.strip():
+                        empty_count += 1
+                if t:
+                    buf.write(t)
+                    buf.write("\n")
+                page.close()
+    # mostly empty text across samples -> likely scanned
+    is_scanned_hint = empty_count >= max(1, n_sampled - 1)
+    out = buf.getvalue()
     # optional: mild de-dup of repeated lines
     lines = out.splitlines()
     lines = de_duplicate_headers_footers(lines)
-    return "\n".join(lines)
+    return "\n".join(lines), is_scanned_hint
 
 # ---------- DOCX ----------
 
@@ -103,22 +147,27 @@ def extract_text_from_docx(path: str) -> str:
 
 # ---------- Public API ----------
 
-def extract_resume_text(file_path: str, clean: bool = True) -> Tuple[str, str]:
-    """
-    Returns (raw_text, cleaned_text)
-    cleaned_text may equal raw_text if clean=False.
-    """
+def _extract_raw(file_path: str, layout: bool = False) -> Tuple[str, bool]:
+    """Returns (raw_text, is_scanned_hint); the hint is only ever True for PDFs."""
     if not os.path.isfile(file_path):
         raise FileNotFoundError(f"File not found: {file_path}")
 
     ext = os.path.splitext(file_path)[1].lower()
     if ext == ".pdf":
-        raw = extract_text_from_pdf(file_path)
+        return extract_text_from_pdf(file_path, layout=layout)
     elif ext in (".docx",):
-        raw = extract_text_from_docx(file_path)
+        return extract_text_from_docx(file_path), False
     else:
         raise ValueError("Unsupported format. Use PDF or DOCX.")
 
+def extract_resume_text(file_path: str, clean: bool = True, layout: bool = False) -> Tuple[str, str]:
+    """
+    Returns (raw_text, cleaned_text)
+    cleaned_text may equal raw_text if clean=False.
+    layout=True uses pdfplumber's layout-aware PDF extraction (slower).
+    """
+    raw, _ = _extract_raw(file_path, layout=layout)
+
     if clean:
         return raw, clean_text(raw)
     else:
@@ -131,13 +180,15 @@ def main():
     parser.add_argument("input", help="Path to resume (.pdf or .docx)")
     parser.add_argument("-o", "--output", default="extracted_resume.txt", help="Output .txt path (default: extracted_resume.txt)")
     parser.add_argument("--no-clean", action="store_true", help="Do not clean text (save raw)")
+    parser.add_argument("--layout", action="store_true", help="Layout-aware PDF extraction via pdfplumber (slower)")
     args = parser.parse_args()
 
     try:
-        if os.path.splitext(args.input)[1].lower() == ".pdf" and is_scanned_pdf(args.input):
+        raw, is_scanned = _extract_raw(args.input, layout=args.layout)
+        if is_scanned:
             print("⚠️  This looks like a scanned PDF (image-only). Text may be empty without OCR.")
 
-        raw, cleaned = extract_resume_text(args.input, clean=not args.no_clean)
+        cleaned = raw if args.no_clean else clean_text(raw)
         with open(args.output, "w", encoding="utf-8") as f:
             f.write(cleaned)
 
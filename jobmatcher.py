@@ -1,70 +1,331 @@
 # jobmatcher.py
+import argparse
+import functools
 import re
-from typing import Set, List, Tuple, Dict
+from types import MappingProxyType
+from typing import Iterable, Mapping, Set, List, Tuple, Dict
 
-import spacy
-nlp = spacy.load("en_core_web_sm")
+import numpy as np
+
+@functools.lru_cache(maxsize=None)
+def _get_nlp():
+    """Load spaCy lazily: the default stemming path never needs the model."""
+    import spacy
+    # NER is never used for keyword extraction; skip it to save CPU per doc
+    return spacy.load("en_core_web_sm", disable=["ner"])
+
+# English stop words (spaCy's list, alphabetic entries) shipped inline so the
+# stemming path never imports spaCy
+_STOP_WORDS = frozenset("""
+    a about above across after afterwards again against all almost alone along
+    already also although always am among amongst amount an and another any anyhow
+    anyone anything anyway anywhere are around as at back be became because become
+    becomes becoming been before beforehand behind being below beside besides
+    between beyond both bottom but by ca call can cannot could did do does doing
+    done down due during each eight either eleven else elsewhere empty enough even
+    ever every everyone everything everywhere except few fifteen fifty first five
+    for former formerly forty four from front full further get give go had has have
+    he hence her here hereafter hereby herein hereupon hers herself him himself his
+    how however hundred i if in indeed into is it its itself just keep last latter
+    latterly least less made make many may me meanwhile might mine more moreover
+    most mostly move much must my myself name namely neither never nevertheless next
+    nine no nobody none noone nor not nothing now nowhere of off often on once one
+    only onto or other others otherwise our ours ourselves out over own part per
+    perhaps please put quite rather re really regarding same say see seem seemed
+    seeming seems serious several she should show side since six sixty so some
+    somehow someone something sometime sometimes somewhere still such take ten than
+    that the their them themselves then thence there thereafter thereby therefore
+    therein thereupon these they third this those though three through throughout
+    thru thus to together too top toward towards twelve twenty two under unless
+    until up upon us used using various very via was we well were what whatever when
+    whence whenever where whereafter whereas whereby wherein whereupon wherever
+    whether which while whither who whoever whole whom whose why will with within
+    without would yet you your yours yourself yourselves
+""".split())
+
+# Optional: fast stemming path instead of spaCy (pip install PyStemmer)
+try:
+    import Stemmer
+    _stemmer = Stemmer.Stemmer("english")
+    HAVE_STEMMER = True
+except Exception:
+    HAVE_STEMMER = False
 
 # Optional: fuzzy matching (pip install rapidfuzz)
 try:
-    from rapidfuzz import process, fuzz
+    from rapidfuzz import fuzz
+    from rapidfuzz.process import cdist
     HAVE_FUZZ = True
 except Exception:
     HAVE_FUZZ = False
 
+# Optional: JIT fuzzy scorer, only imported when rapidfuzz is unavailable (pip install numba)
+HAVE_NUMBA = False
+if not HAVE_FUZZ:
+    try:
+        from numba import njit, prange
+        HAVE_NUMBA = True
+    except Exception:
+        pass
+
+# Optional: Aho-Corasick exact-match fast path (pip install pyahocorasick)
+try:
+    import ahocorasick
+    HAVE_AHO = True
+except Exception:
+    HAVE_AHO = False
+
 # Tech-friendly token pattern (keeps + # / . _ &)
-TECH_TOKEN_RE = re.compile(r"[a-zA-Z0-9][a-zA-Z0-9+\-#/_\.&]*")
+TECH_TOKEN_RE = re.compile(r"[a-zA-Z0-9][a-zA-Z0-9+\-#/_\.&]*", re.ASCII)
+
+# Very small stop additions to avoid junk
+_NOISE = frozenset({"experience", "work", "year", "years", "role", "responsibility", "project"})
+_STEM_NOISE = _NOISE | frozenset(_stemmer.stemWords(list(_NOISE))) if HAVE_STEMMER else _NOISE
+
+def _tech_tokens_lowered(text_lower: str) -> Set[str]:
+    """_tech_tokens for text that is already lowercased."""
+    return {t for m in TECH_TOKEN_RE.finditer(text_lower)
+            if len(t := m.group(0).strip(" ._-/\\")) > 1}
 
 def _tech_tokens(text: str) -> Set[str]:
     """Regex tokens to preserve things like C++, C#, Node.js, CI/CD."""
-    toks = {t.lower().strip(" ._-/\\") for t in TECH_TOKEN_RE.findall(text)}
-    return {t for t in toks if len(t) > 1}
+    return _tech_tokens_lowered(text.lower())
 
-def extract_keywords(text: str) -> Set[str]:
+def _keywords_from_doc(doc, text_lower: str) -> Set[str]:
     """
-    Extract keywords from text:
-    - spaCy lemmas for NOUN/PROPN/ADJ/VERB (skip stopwords/punct/nums)
-    - noun chunks (multi-word phrases)
-    - regex tech tokens (keeps C++, C#, CI/CD, Node.js, etc.)
+    Collect lemmas, noun-chunk phrases and tech tokens from a doc parsed
+    from text_lower (already lowercased, so lemmas need no further lower()).
     """
-    text = text or ""
-    doc = nlp(text)
+    from spacy.attrs import POS, LEMMA, IS_STOP, IS_PUNCT, LIKE_NUM
+    from spacy.symbols import NOUN, PROPN, ADJ, VERB
 
-    lemmas: List[str] = []
-    for tok in doc:
-        if tok.is_stop or tok.is_punct or tok.like_num:
-            continue
-        if tok.pos_ in {"NOUN", "PROPN", "ADJ", "VERB"}:
-            lem = tok.lemma_.lower().strip()
-            if len(lem) > 1:
-                lemmas.append(lem)
+    # Filter tokens on a numpy attribute matrix instead of per-token getattrs;
+    # np.unique dedups lemma hashes before any string is materialized.
+    arr = doc.to_array([POS, LEMMA, IS_STOP, IS_PUNCT, LIKE_NUM])
+    mask = ((arr[:, 2] == 0) & (arr[:, 3] == 0) & (arr[:, 4] == 0)
+            & np.isin(arr[:, 0], [NOUN, PROPN, ADJ, VERB]))
+    strings = doc.vocab.strings
+    lemmas = [lem for lem in (strings[int(h)].strip() for h in np.unique(arr[mask, 1]))
+              if len(lem) > 1]
 
     phrases: List[str] = []
     for chunk in doc.noun_chunks:
-        words = [t.lemma_.lower() for t in chunk if not (t.is_stop or t.is_punct)]
-        phrase = " ".join(w for w in words if len(w) > 1)
-        if phrase.count(" ") >= 1:  # keep 2+ word phrases
-            phrases.append(phrase)
+        parts = [t.lemma_ for t in chunk
+                 if not (t.is_stop or t.is_punct) and len(t.lemma_) > 1]
+        if len(parts) >= 2:  # keep 2+ word phrases
+            phrases.append(" ".join(parts))
 
-    tech = _tech_tokens(text)
+    tech = _tech_tokens_lowered(text_lower)
 
     # Combine and lightly prune obvious noise
-    out = set(lemmas) | set(phrases) | tech
-    # Very small stop additions to avoid junk
-    noise = {"experience", "work", "year", "years", "role", "responsibility", "project"}
-    return {t for t in out if t not in noise}
+    return (set(lemmas) | set(phrases) | tech) - _NOISE
+
+@functools.lru_cache(maxsize=128)
+def _stem_analysis(text_lower: str) -> Tuple[frozenset, Mapping[str, str]]:
+    """
+    Returns (keywords, stem -> surface word) without spaCy.
+    Plain alphabetic words are Snowball-stemmed; tech tokens (C++, CI/CD,
+    Node.js, k8s, ...) are kept as-is. The surface word for a stem is its
+    shortest form in the text, for display. Both parts are immutable since
+    the cached value is shared by every caller.
+    """
+    tokens = _tech_tokens_lowered(text_lower)
+    words = sorted(t for t in tokens if t.isalpha() and t not in _STOP_WORDS)
+    tech = {t for t in tokens if not t.isalpha()}
+
+    surface: Dict[str, str] = {}
+    for word, stem in zip(words, _stemmer.stemWords(words)):
+        if stem not in surface or len(word) < len(surface[stem]):
+            surface[stem] = word
+    return frozenset((set(surface) | tech) - _STEM_NOISE), MappingProxyType(surface)
+
+@functools.lru_cache(maxsize=128)
+def _spacy_keywords_cached(text: str) -> frozenset:
+    text_lower = text.lower()  # lowercase once, shared by spaCy and the regex
+    return frozenset(_keywords_from_doc(_get_nlp()(text_lower), text_lower))
+
+def extract_keywords(text: str, deep: bool = False) -> Set[str]:
+    """
+    Extract keywords from text:
+    - default: Snowball stems of plain non-stopword words (PyStemmer);
+      use to_surface() to turn them back into readable words
+    - deep=True (or PyStemmer missing): spaCy lemmas for NOUN/PROPN/ADJ/VERB
+      (skip stopwords/punct/nums) plus noun chunks (multi-word phrases)
+    - always: regex tech tokens (keeps C++, C#, CI/CD, Node.js, etc.)
+    Results are memoized per text, so repeat calls skip the work.
+    Compare only keyword sets built with the same deep setting.
+    """
+    text = text or ""
+    if deep or not HAVE_STEMMER:
+        return set(_spacy_keywords_cached(text))
+    return set(_stem_analysis(text.lower())[0])
+
+def to_surface(terms: Iterable[str], text: str, deep: bool = False) -> Set[str]:
+    """
+    Map keywords from extract_keywords(text) back to readable words from text
+    (e.g. stem "manag" -> "managed"). Other terms pass through unchanged.
+    """
+    if deep or not HAVE_STEMMER:
+        return set(terms)
+    surface = _stem_analysis((text or "").lower())[1]
+    return {surface.get(t, t) for t in terms}
+
+def extract_keywords_batch(texts: Iterable[str], deep: bool = False) -> List[Set[str]]:
+    """Like extract_keywords; the spaCy path runs all texts through a single nlp.pipe call."""
+    if not deep and HAVE_STEMMER:
+        return [extract_keywords(t) for t in texts]
+    texts = [(t or "").lower() for t in texts]
+    docs = _get_nlp().pipe(texts, batch_size=8)
+    return [_keywords_from_doc(doc, t) for doc, t in zip(docs, texts)]
+
+def build_keyword_automaton(keywords: Iterable[str]):
+    """Compile keywords into an Aho-Corasick automaton (None if unavailable/empty)."""
+    keywords = [kw for kw in keywords if kw]
+    if not HAVE_AHO or not keywords:
+        return None
+    automaton = ahocorasick.Automaton()
+    for kw in keywords:
+        automaton.add_word(kw, kw)
+    automaton.make_automaton()
+    return automaton
+
+# Characters TECH_TOKEN_RE treats as part of a token, and the ones
+# _tech_tokens strips from a token's end
+_TOKEN_CHARS = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789+-#/_.&")
+_STRIP_CHARS = frozenset(" ._-/\\")
+
+def scan_keywords(automaton, text: str) -> Set[str]:
+    """
+    Single pass over text; returns automaton keywords that are a whole
+    token, tokenized exactly like _tech_tokens (so "java" is not a hit in
+    "javascript" or "java/spring", but is in "java." or "(java)").
+    """
+    text = (text or "").lower()
+    n = len(text)
+    found = set()
+    for end, kw in automaton.iter(text):
+        start = end - len(kw) + 1
+        # the token must start at the hit: anything glued on the left is non-alnum
+        i = start - 1
+        while i >= 0 and text[i] in _TOKEN_CHARS:
+            if text[i].isalnum():
+                break
+            i -= 1
+        else:
+            # and only strippable characters may follow it on the right
+            j = end + 1
+            while j < n and text[j] in _TOKEN_CHARS:
+                if text[j] not in _STRIP_CHARS:
+                    break
+                j += 1
+            else:
+                found.add(kw)
+    return found
+
+def _literal_hit_is_keyword(terms: Set[str], deep: bool) -> bool:
+    """
+    True if finding each term as a whole token guarantees extract_keywords
+    emits it: single tokens only, and in stem mode, alphabetic terms must be
+    non-stopwords that stem to themselves.
+    """
+    if any(" " in t for t in terms):
+        return False
+    if deep or not HAVE_STEMMER:
+        return True
+    words = [t for t in terms if t.isalpha()]
+    if any(w in _STOP_WORDS for w in words):
+        return False
+    return all(w == st for w, st in zip(words, _stemmer.stemWords(words)))
+
+def extract_resume_keywords(resume_text: str, jd_keywords: Set[str],
+                            automaton=None, deep: bool = False) -> Set[str]:
+    """
+    Resume keywords for matching against jd_keywords.
+    Fast path: scan the raw resume once with the JD automaton (no spaCy).
+    It is used only when every JD term is found as a whole token and such a
+    hit guarantees full extraction would emit that term too, so the match
+    result is the same. Otherwise, fall back to extract_keywords
+    (inflected forms vs. lemmas/stems, fuzzy matches against the resume's
+    own vocabulary).
+    deep must match the setting used to build jd_keywords.
+    """
+    if automaton is None:
+        automaton = build_keyword_automaton(jd_keywords)
+    if automaton is not None and jd_keywords and _literal_hit_is_keyword(jd_keywords, deep):
+        found = scan_keywords(automaton, resume_text)
+        if found == jd_keywords:
+            return found
+    return extract_keywords(resume_text, deep=deep)
+
+if HAVE_NUMBA:
+    @njit(parallel=True, cache=True)
+    def _best_ratios(a_buf, a_off, b_buf, b_off):
+        """
+        For each term in a, best Indel similarity (0..100, as fuzz.ratio)
+        against all terms in b. Terms are packed SoA style: one uint8 buffer
+        plus int64 offsets, so term i is buf[off[i]:off[i + 1]].
+        """
+        n_a = len(a_off) - 1
+        n_b = len(b_off) - 1
+        max_lb = 0
+        for j in range(n_b):
+            max_lb = max(max_lb, b_off[j + 1] - b_off[j])
+        best = np.zeros(n_a, dtype=np.float64)
+        for i in prange(n_a):
+            a0 = a_off[i]
+            la = a_off[i + 1] - a0
+            row = np.zeros(max_lb + 1, dtype=np.int64)
+            for j in range(n_b):
+                b0 = b_off[j]
+                lb = b_off[j + 1] - b0
+                if la + lb == 0:  # empty vs empty scores 0, as in rapidfuzz
+                    continue
+                # LCS length via a single DP row; Indel ratio = 2*LCS / (la+lb)
+                row[:lb + 1] = 0
+                for x in range(la):
+                    ca = a_buf[a0 + x]
+                    diag = 0
+                    for y in range(1, lb + 1):
+                        up = row[y]
+                        if ca == b_buf[b0 + y - 1]:
+                            row[y] = diag + 1
+                        elif row[y - 1] > up:
+                            row[y] = row[y - 1]
+                        diag = up
+                score = 200.0 * row[lb] / (la + lb)
+                if score > best[i]:
+                    best[i] = score
+        return best
+
+def _pack_terms(terms: List[str]):
+    """Token-sort each term and pack all of them into (uint8 buffer, offsets)."""
+    encoded = [" ".join(sorted(set(t.split()))).encode() for t in terms]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(e) for e in encoded], out=offsets[1:])
+    buf = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+    return buf, offsets
 
 def _fuzzy_matched(jd_terms: Set[str], resume_terms: Set[str], cutoff: int = 88) -> Set[str]:
-    """Return JD terms that are near-matched in resume terms (token_set similarity)."""
-    if not HAVE_FUZZ or not jd_terms or not resume_terms:
+    """
+    Return JD terms that are near-matched in resume terms.
+    rapidfuzz: token_set_ratio. Numba fallback (no rapidfuzz): Indel ratio on
+    token-sorted terms, which is stricter for subset terms, e.g. "kubernetes"
+    vs "kubernetes cluster" scores 71 there but 100 under token_set_ratio.
+    """
+    if not jd_terms or not resume_terms:
         return set()
+    jd_list = list(jd_terms)
     res_list = list(resume_terms)
-    matched = set()
-    for t in jd_terms:
-        hit = process.extractOne(t, res_list, scorer=fuzz.token_set_ratio)
-        if hit and hit[1] >= cutoff:
-            matched.add(t)
-    return matched
+    if HAVE_FUZZ:
+        # One batched M x N score matrix (scores below cutoff come back as 0)
+        scores = cdist(jd_list, res_list, scorer=fuzz.token_set_ratio,
+                       score_cutoff=cutoff, workers=-1, dtype=np.uint8)
+        return {jd_list[i] for i in np.flatnonzero(scores.max(axis=1) >= cutoff)}
+    if HAVE_NUMBA:
+        # token-sort ratio, parallel over JD terms
+        best = _best_ratios(*_pack_terms(jd_list), *_pack_terms(res_list))
+        return {jd_list[i] for i in np.flatnonzero(best >= cutoff)}
+    return set()
 
 def calculate_match(resume_keywords: Set[str], jd_keywords: Set[str]) -> Dict:
     """
@@ -99,18 +360,34 @@ def calculate_match(resume_keywords: Set[str], jd_keywords: Set[str]) -> Dict:
         "score": round(score, 2),
     }
 
+@functools.lru_cache(maxsize=256)
+def _calculate_match_frozen(resume_keywords: frozenset, jd_keywords: frozenset) -> Dict:
+    res = calculate_match(resume_keywords, jd_keywords)
+    return {k: frozenset(v) if isinstance(v, (set, frozenset)) else v for k, v in res.items()}
+
+def calculate_match_cached(resume_keywords: frozenset, jd_keywords: frozenset) -> Dict:
+    """
+    Memoized calculate_match for hashable (frozenset) keyword sets.
+    The cached result is shared across callers, so term sets are frozensets
+    and each call gets its own copy of the dict.
+    """
+    return dict(_calculate_match_frozen(resume_keywords, jd_keywords))
+
 def match_resume_to_job(resume_text: str, jd_text: str) -> Tuple[Set[str], Set[str], float]:
     """
     Back-compat: returns (common, missing, score)
     Uses improved extraction + scoring (exact + fuzzy). The 'common' here
     includes only exact matches to keep behavior predictable.
     """
-    resume_kw = extract_keywords(resume_text)
-    jd_kw = extract_keywords(jd_text)
+    resume_kw, jd_kw = extract_keywords_batch([resume_text, jd_text])
     res = calculate_match(resume_kw, jd_kw)
     return res["common"], res["missing"], res["score"]
 
 def main():
+    parser = argparse.ArgumentParser(description="Match extracted resume text against a job description.")
+    parser.add_argument("--deep", action="store_true", help="Use spaCy lemmas + noun chunks instead of fast stemming")
+    args = parser.parse_args()
+
     # Load resume text extracted earlier
     with open("extracted_resume.txt", "r", encoding="utf-8") as f:
         resume_text = f.read()
@@ -118,10 +395,16 @@ def main():
     # Get job description from user
     jd_text = input("\nPaste Job Description:\n\n")
 
-    resume_keywords = extract_keywords(resume_text)
-    jd_keywords = extract_keywords(jd_text)
+    resume_keywords = extract_keywords(resume_text, deep=args.deep)
+    jd_keywords = extract_keywords(jd_text, deep=args.deep)
     result = calculate_match(resume_keywords, jd_keywords)
 
+    # show words, not stems (all result terms come from the JD)
+    resume_keywords = to_surface(resume_keywords, resume_text, deep=args.deep)
+    jd_keywords = to_surface(jd_keywords, jd_text, deep=args.deep)
+    for k in ("common", "fuzzy_common", "missing"):
+        result[k] = to_surface(result[k], jd_text, deep=args.deep)
+
     # Nice printing with limits to avoid walls of text
     def fmt(sample: Set[str], limit=60):
         arr = sorted(sample)
@@ -131,7 +414,7 @@ def main():
     print(f"✅ Resume keywords:\n{fmt(resume_keywords)}\n")
     print(f"📌 JD keywords:\n{fmt(jd_keywords)}\n")
     print(f"🎯 Exact matches:\n{fmt(result['common'])}\n")
-    if HAVE_FUZZ:
+    if HAVE_FUZZ or HAVE_NUMBA:
         print(f"~ Close matches (fuzzy):\n{fmt(result['fuzzy_common'])}\n")
     print(f"➕ Consider adding:\n{fmt(result['missing']) if result['missing'] else 'None 🎉'}\n")
     print(f"🔢 Match Score: {result['score']}%\n")